@@ -8,7 +8,7 @@ custom validator to ensure that the `price` attribute has at most two decimal pl
 
 Attributes:
     title (str): The title of the book.
-    price (Decimal): The non-zero price of the book, maintained with 2-decimal precision.
+    price (float): The non-zero price of the book, rounded to 2 decimal places.
     rating (int): The rating of the book on a scale of 1 to 5.
     description (str): A detailed description of the book.
     category (str): The category to which the book belongs.
@@ -17,14 +17,11 @@ Attributes:
     image_url (HttpUrl): A valid HTTP URL pointing to the book's image.
     book_url (HttpUrl): A valid HTTP URL with more details about the book.
 
-Model Config:
-    - json_encoders: Custom JSON encoding for Decimal and HttpUrl types.
-    - arbitrary_types_allowed: Enables usage of arbitrary types in the model.
+Serialization relies on Pydantic's built-in JSON-mode handling of HttpUrl, so
+the model needs no custom configuration.
 """
 
 from pydantic import BaseModel, Field, HttpUrl, field_validator
-from decimal import Decimal
-from typing import List, Optional, Dict, Any
 
 
 class Book(BaseModel):
@@ -33,7 +30,7 @@ class Book(BaseModel):
 
     Attributes:
         title (str): The title of the book. Must be at least 1 character long.
-        price (Decimal): The price of the book. Must be a positive value and is
+        price (float): The price of the book. Must be a positive value and is
             automatically rounded to two decimal places.
         rating (int): The rating of the book, which must be between 1 and 5.
         description (str): A detailed description of the book.
@@ -44,7 +41,7 @@ class Book(BaseModel):
         book_url (HttpUrl): A valid URL containing additional book details.
     """
     title: str = Field(..., min_length=1, description="The title of the book")
-    price: Decimal = Field(..., gt=0, description="The price of the book")
+    price: float = Field(..., gt=0, description="The price of the book")
     rating: int = Field(..., gt=0, le=5, description="The rating of the book (1-5)")
     description: str = Field(..., description="The description of the book")
     category: str = Field(..., description="The category of the book")
@@ -59,23 +56,12 @@ class Book(BaseModel):
         Ensure that the price has a maximum of two decimal places.
 
         This validator takes the incoming price value and ensures that it is
-        quantized to two decimal places, thereby standardizing the price format.
+        rounded to two decimal places, thereby standardizing the price format.
 
         Args:
-            v (Decimal): The price value supplied to the model.
+            v (float): The price value supplied to the model.
 
         Returns:
-            Decimal: The price value rounded to exactly two decimal places.
+            float: The price value rounded to two decimal places.
         """
-        # Convert the value to a Decimal using its string representation
-        # to avoid floating point precision issues, then quantize to 0.01
-        return Decimal(str(v)).quantize(Decimal('0.01'))
-    
-    # Custom configuration for the Pydantic model
-    model_config = {
-        "json_encoders": {
-            Decimal: lambda d: str(d),
-            HttpUrl: lambda url: str(url),
-        },
-        "arbitrary_types_allowed": True,
-    }
+        return round(float(v), 2)
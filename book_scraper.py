@@ -1,6 +1,6 @@
 """
 This module provides functionality to scrape book data from an online catalogue.
-It uses asynchronous requests along with BeautifulSoup to extract information about each book,
+It uses asynchronous requests along with C-backed HTML parsers to extract information about each book,
 such as title, price, rating, category, UPC, availability, and description.
 
 Classes:
@@ -9,23 +9,49 @@ Classes:
                  
 Dependencies:
     - asyncio-compatible HTTP session library (e.g., aiohttp)
-    - BeautifulSoup for HTML parsing
-    - word2number for converting word numbers to numeric values
+    - lxml (precompiled XPath) for catalogue-page parsing
+    - selectolax (Lexbor engine) for detail-page parsing
     - pydantic for validating and constructing URL objects
-    - decimal for handling prices as Decimal values
 """
 
-from decimal import Decimal
+import aiohttp
+import asyncio
 import logging
 import re
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin
 from pydantic import HttpUrl
-from word2number import w2n
 from book_model import Book
 
 logger = logging.getLogger(__name__)
 
+# Precompiled pattern for extracting decimal and integer numbers from text
+# (prices, stock counts). Matching decimals first keeps "51.77" in one piece.
+_NUM_RE = re.compile(r"\d+\.\d+|\d+")
+
+# Pattern for the pager text on catalogue pages, e.g. "Page 1 of 50".
+_PAGE_COUNT_RE = re.compile(r"Page \d+ of (\d+)")
+
+# XPath expressions for catalogue pages, compiled once so each evaluation is a
+# single call into lxml's C engine.
+_X_BOOK_HREFS = etree.XPath('//article[contains(@class, "product_pod")]//h3/a/@href')
+_X_PAGER_CURRENT = etree.XPath('string(//li[contains(@class, "current")])')
+
+# Maximum number of catalogue pages fetched concurrently.
+CATALOGUE_FETCH_LIMIT = 32
+
+# Retry policy for transient HTTP failures (connection errors, timeouts, 5xx):
+# up to MAX_RETRIES attempts with exponential backoff starting at
+# RETRY_BACKOFF_SECONDS. A failed book otherwise means a full catalogue re-run.
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.25
+
+# The star-rating class word can only take these values, so a dict lookup
+# replaces the general-purpose word-to-number parser.
+_RATING = {'Zero': 0, 'One': 1, 'Two': 2, 'Three': 3, 'Four': 4, 'Five': 5}
+
 class BookScraper:
     """
     A scraper that fetches book URLs from a catalogue and extracts detailed information from each book's page.
@@ -45,12 +71,52 @@ class BookScraper:
         self.base_url = base_url
         self.catalogue_url = urljoin(base_url, "catalogue/")
 
+    async def _read_with_retry(self, session, url: str) -> tuple[int, bytes]:
+        """
+        Fetch a URL, retrying transient failures with exponential backoff.
+
+        Connection errors, timeouts and 5xx responses are treated as transient and
+        retried up to MAX_RETRIES times, sleeping RETRY_BACKOFF_SECONDS * 2**attempt
+        between attempts. Non-5xx statuses (including 404) are returned to the caller
+        as-is, since they carry meaning for catalogue traversal.
+
+        Args:
+            session (aiohttp.ClientSession): An asynchronous HTTP session used to make GET requests.
+            url (str): The URL to fetch.
+
+        Returns:
+            tuple[int, bytes]: The final response status and raw body.
+
+        Raises:
+            The last transport error if every attempt failed, or RuntimeError if every
+            attempt returned a 5xx status.
+        """
+        last_exc = None
+        last_status = None
+        for attempt in range(MAX_RETRIES):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            try:
+                async with session.get(url) as response:
+                    if response.status >= 500:
+                        last_status = response.status
+                        logger.warning(f"Transient {response.status} from {url} (attempt {attempt + 1}/{MAX_RETRIES}).")
+                        continue
+                    return response.status, await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_exc = e
+                logger.warning(f"Transient error fetching {url} (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+        if last_exc is not None:
+            raise last_exc
+        raise RuntimeError(f"Got {last_status} from {url} on all {MAX_RETRIES} attempts")
+
     async def get_all_book_urls(self, session) -> list[str]:
         """
         Asynchronously fetch and return all book URLs from the paginated catalogue.
 
-        The method iterates over catalogue pages by incrementing the page number until a page returns a 404 status
-        or no book containers are found in the HTML response. It extracts book URLs found in the '.product_pod' elements.
+        Convenience wrapper that drains `iter_book_urls` into a list for callers that
+        need every URL up front. URLs appear in the order the catalogue pages finish,
+        which is not necessarily page order.
 
         Args:
             session (aiohttp.ClientSession): An asynchronous HTTP session used to make GET requests.
@@ -61,47 +127,162 @@ class BookScraper:
         Raises:
             Logs any exceptions that occur while fetching pages without throwing them onward.
         """
-        book_urls = []
-        page_num = 1
+        book_urls = [url async for url in self.iter_book_urls(session)]
+        logger.info(f"Total books found: {len(book_urls)}")
+        return book_urls
+
+    async def iter_book_urls(self, session):
+        """
+        Asynchronously yield book URLs as catalogue pages are parsed.
+
+        This async generator starts yielding URLs as soon as the first catalogue page is
+        parsed, so callers can begin fetching book pages while the rest of the catalogue
+        is still being discovered. Remaining pages are fetched concurrently (bounded by
+        CATALOGUE_FETCH_LIMIT) and their URLs are yielded in completion order; if the
+        total page count cannot be determined, pages are walked sequentially instead.
+
+        Args:
+            session (aiohttp.ClientSession): An asynchronous HTTP session used to make GET requests.
+
+        Yields:
+            str: Fully-qualified URLs pointing to individual book pages.
+        """
+        try:
+            # Read raw bytes; lxml decodes them in C, which avoids the
+            # charset sniffing that response.text() may perform.
+            status, html_bytes = await self._read_with_retry(session, f"{self.catalogue_url}page-1.html")
+        except Exception as e:
+            logger.error(f"Error fetching page 1: {e}")
+            return
+        if status == 404:
+            logger.info("Page 1 not found (404). Catalogue is empty.")
+            return
+
+        doc = lxml_html.fromstring(html_bytes)
+        for url in self._parse_catalogue_page(doc, 1):
+            yield url
+        total_pages = self._parse_total_pages(doc)
+
+        if total_pages is None:
+            logger.warning("Could not determine total page count. Falling back to sequential traversal.")
+            async for url in self._iter_book_urls_sequential(session, start_page=2):
+                yield url
+        elif total_pages > 1:
+            # Fetch the remaining pages concurrently and yield each page's URLs
+            # as soon as that page has been parsed.
+            semaphore = asyncio.Semaphore(CATALOGUE_FETCH_LIMIT)
+            tasks = [
+                asyncio.ensure_future(self._scrape_catalogue_page(session, page_num, semaphore))
+                for page_num in range(2, total_pages + 1)
+            ]
+            try:
+                for next_page in asyncio.as_completed(tasks):
+                    for url in await next_page:
+                        yield url
+            finally:
+                # If the caller abandons this generator mid-fan-out (e.g. a
+                # pipeline stage failed and cancelled the producer), reap the
+                # page fetches that are still pending; otherwise they would
+                # linger on the long-lived loop and resume on the next warm
+                # invocation, holding connector slots against the new run.
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _parse_total_pages(self, doc) -> int | None:
+        """
+        Parse the total number of catalogue pages from a page's pager text.
+
+        Args:
+            doc (lxml.html.HtmlElement): A parsed catalogue page.
+
+        Returns:
+            int | None: The total page count, or None if the pager text is absent or unrecognized.
+        """
+        match = _PAGE_COUNT_RE.search(_X_PAGER_CURRENT(doc))
+        if match:
+            return int(match.group(1))
+        return None
+
+    def _parse_catalogue_page(self, doc, page_num: int) -> list[str]:
+        """
+        Extract the full book URLs from a parsed catalogue page.
+
+        Args:
+            doc (lxml.html.HtmlElement): A parsed catalogue page.
+            page_num (int): The page number, used for logging only.
+
+        Returns:
+            list[str]: The fully-qualified book URLs found in the page's '.product_pod' elements.
+        """
+        # Catalogue hrefs are always relative paths like 'the-book/index.html',
+        # so plain concatenation with the catalogue prefix matches what urljoin
+        # would produce without its per-call parsing overhead.
+        prefix = self.catalogue_url
+        page_urls = [prefix + href for href in _X_BOOK_HREFS(doc) if href]
+        logger.info(f"Collected URLs from page {page_num}")
+        return page_urls
+
+    async def _scrape_catalogue_page(self, session, page_num: int, semaphore: asyncio.Semaphore) -> list[str]:
+        """
+        Fetch and parse a single catalogue page, bounded by the given semaphore.
+
+        Args:
+            session (aiohttp.ClientSession): An asynchronous HTTP session used to make GET requests.
+            page_num (int): The catalogue page number to fetch.
+            semaphore (asyncio.Semaphore): Limits how many page fetches run concurrently.
+
+        Returns:
+            list[str]: The book URLs found on the page, or an empty list if the fetch fails.
+        """
+        async with semaphore:
+            try:
+                _, html_bytes = await self._read_with_retry(session, f"{self.catalogue_url}page-{page_num}.html")
+                return self._parse_catalogue_page(lxml_html.fromstring(html_bytes), page_num)
+            except Exception as e:
+                logger.error(f"Error fetching page {page_num}: {e}")
+                return []
+
+    async def _iter_book_urls_sequential(self, session, start_page: int):
+        """
+        Sequential catalogue traversal used when the total page count is unknown.
+
+        Walks pages one at a time starting from `start_page`, yielding each page's book
+        URLs as it is parsed, until a page returns a 404 status or contains no book
+        containers.
+
+        Args:
+            session (aiohttp.ClientSession): An asynchronous HTTP session used to make GET requests.
+            start_page (int): The first page number to fetch.
+
+        Yields:
+            str: The book URLs collected from the traversed pages.
+        """
+        page_num = start_page
         while True:
-            page_url = f"{self.catalogue_url}page-{page_num}.html"
             try:
-                async with session.get(page_url) as response:
-                    if response.status == 404:
-                        logger.info(f"Page {page_num} not found (404). Ending catalogue traversal.")
-                        break
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Find all book containers on the current page
-                    book_containers = soup.select('.product_pod')
-                    if not book_containers:
-                        logger.info(f"No book containers found on page {page_num}. Ending catalogue traversal.")
-                        break
-                    
-                    # Extract and store full book URLs
-                    for book in book_containers:
-                        book_url = book.select_one('h3 a')['href']
-                        if book_url:
-                            full_url = urljoin(self.catalogue_url, book_url)
-                            book_urls.append(full_url)
-                    
-                    logger.info(f"Collected URLs from page {page_num}")
-                    page_num += 1
-            
+                status, html_bytes = await self._read_with_retry(session, f"{self.catalogue_url}page-{page_num}.html")
+                if status == 404:
+                    logger.info(f"Page {page_num} not found (404). Ending catalogue traversal.")
+                    break
+                doc = lxml_html.fromstring(html_bytes)
+                page_urls = self._parse_catalogue_page(doc, page_num)
+                if not page_urls:
+                    logger.info(f"No book containers found on page {page_num}. Ending catalogue traversal.")
+                    break
+                page_num += 1
             except Exception as e:
                 logger.error(f"Error fetching page {page_num}: {e}")
                 break
-
-        logger.info(f"Total books found: {len(book_urls)}")
-        return book_urls
+            for url in page_urls:
+                yield url
 
     async def extract_one_book_info(self, session, book_url: str) -> Book | None:
         """
         Asynchronously extract detailed book information from a single book page.
 
-        This method makes an asynchronous GET request to the book page URL and uses BeautifulSoup to parse the 
-        returned HTML. It extracts various details:
+        This method makes an asynchronous GET request to the book page URL and hands the raw
+        bytes to `parse_book_page`. Extracted details:
            - Title, Price, and Rating (converted from words to numbers)
            - Category (from the breadcrumb navigation)
            - UPC (unique product code)
@@ -121,81 +302,107 @@ class BookScraper:
             Logs parsing or HTTP errors without propagating exceptions.
         """
         try:
-            async with session.get(book_url) as response:
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                try:
-                    book_page = soup.select_one('.product_main')
-                    if not book_page:
-                        raise ValueError("Could not find product main section")
-                    
-                    # Extract title from the book page
-                    title = book_page.select_one('h1').text.strip()
-                    
-                    # Extract price and convert it to a Decimal
-                    price_text = book_page.select_one('p.price_color').text.strip()
-                    price_number = self._extract_numbers(price_text)[0]
-                    price = Decimal(price_number)
-                    
-                    # Extract rating from the class (e.g., "star-rating Three")
-                    rating_class = book_page.select_one('p.star-rating')['class'][1]
-                    rating = w2n.word_to_num(rating_class)
-                    
-                    # Extract category from the breadcrumb navigation
-                    category = soup.select('.breadcrumb li')[2].text.strip()
-                    
-                    # Extract image URL and validate it as an HttpUrl using pydantic
-                    image_src = soup.select_one('.item.active img')['src']
-                    image_url = HttpUrl(urljoin(self.base_url, image_src))
-                    
-                    # Extract UPC from the first table cell found
-                    upc = soup.select_one("td").text.strip()
-                    
-                    # Extract availability details and determine the number of available units
-                    availability = book_page.select_one('.availability').text.strip()
-                    units_number = self._extract_numbers(availability)[0]
-                    stock = int(units_number) if units_number else 0
-                    
-                    # Extract product description if available
-                    description = ''
-                    product_description = soup.select_one('#product_description')
-                    if product_description:
-                        description = product_description.find_next_sibling('p').text.strip()
-                    
-                    # Create and return a Book instance with the scraped values
-                    book_info = Book(
-                        title=title,
-                        price=price,
-                        rating=rating,
-                        description=description,
-                        category=category,
-                        upc=upc,
-                        num_available_units=stock,
-                        image_url=image_url,
-                        book_url=HttpUrl(book_url)
-                    )
-                    return book_info
-                    
-                except (AttributeError, IndexError, ValueError) as e:
-                    logger.error(f"Error parsing book data at {book_url}: {str(e)}")
-                    return None
-                
+            _, html_bytes = await self._read_with_retry(session, book_url)
         except Exception as e:
             logger.error(f"Error fetching book page {book_url}: {str(e)}")
             return None
-        
-    def _extract_numbers(self, s: str) -> list[str]:
-        """
-        Extracts all numeric values (integers and decimals) from a given string.
 
-        The method uses a regular expression that first looks for decimal numbers then integers. This is useful
-        for extracting price values and stock numbers from strings.
+        # Parse inline: a Lexbor pass over a ~50 KB page takes microseconds,
+        # which is cheaper than shipping the bytes to any executor, and the
+        # Lambda runtime cannot create process pools at all (no /dev/shm for
+        # the multiprocessing semaphores).
+        return parse_book_page(html_bytes, book_url, self.base_url)
 
-        Args:
-            s (str): The input string potentially containing numbers.
 
-        Returns:
-            list[str]: A list of string representations of the numbers found in the input string.
-        """
-        return re.findall(r"\d+\.\d+|\d+", s)
+def _extract_first_number(s: str) -> str | None:
+    """
+    Extracts the first numeric value (integer or decimal) from a given string.
+
+    Both hot call sites (price and availability) only need the first match,
+    so this avoids building a full match list.
+
+    Args:
+        s (str): The input string potentially containing numbers.
+
+    Returns:
+        str | None: The first number found, or None if the string has none.
+    """
+    match = _NUM_RE.search(s)
+    return match.group(0) if match else None
+
+
+def parse_book_page(html_bytes: bytes, book_url: str, base_url: str) -> Book | None:
+    """
+    Parse one book detail page into a Book instance.
+
+    This is a pure CPU function (no I/O and no shared state): both parsers run in
+    C, so a full pass over a detail page costs microseconds on the event loop.
+
+    Args:
+        html_bytes (bytes): The raw HTML of the book page.
+        book_url (str): The URL the page was fetched from, used for the book_url field
+                        and for error logging.
+        base_url (str): The site base URL used to resolve the relative image path.
+
+    Returns:
+        Book | None: A Book object with the extracted details if parsing is successful; otherwise, None.
+    """
+    tree = LexborHTMLParser(html_bytes)
+    try:
+        book_page = tree.css_first('.product_main')
+        if not book_page:
+            raise ValueError("Could not find product main section")
+
+        # Extract title from the book page
+        title = book_page.css_first('h1').text(strip=True)
+
+        # Extract price and convert it to a float
+        price_text = book_page.css_first('p.price_color').text(strip=True)
+        price_number = _extract_first_number(price_text)
+        # Round here because model_construct below skips field validators.
+        price = round(float(price_number), 2)
+
+        # Extract rating from the class (e.g., "star-rating Three")
+        rating_class = book_page.css_first('p.star-rating').attributes['class'].split()[-1]
+        rating = _RATING[rating_class]
+
+        # Extract category from the breadcrumb navigation
+        category = tree.css('.breadcrumb li')[2].text(strip=True)
+
+        # Extract image URL and validate it as an HttpUrl using pydantic
+        image_src = tree.css_first('.item.active img').attributes['src']
+        image_url = HttpUrl(urljoin(base_url, image_src))
+
+        # Extract UPC from the first table cell found
+        upc = tree.css_first('td').text(strip=True)
+
+        # Extract availability details and determine the number of available units
+        availability = book_page.css_first('.availability').text(strip=True)
+        units_number = _extract_first_number(availability)
+        stock = int(units_number) if units_number else 0
+
+        # Extract product description if available
+        description = ''
+        description_node = tree.css_first('#product_description + p')
+        if description_node:
+            description = description_node.text(strip=True)
+
+        # Create and return a Book instance with the scraped values.
+        # The scraper has already coerced every field to its target
+        # type, so skip Pydantic's full validation pass.
+        book_info = Book.model_construct(
+            title=title,
+            price=price,
+            rating=rating,
+            description=description,
+            category=category,
+            upc=upc,
+            num_available_units=stock,
+            image_url=image_url,
+            book_url=HttpUrl(book_url)
+        )
+        return book_info
+
+    except (AttributeError, IndexError, KeyError, ValueError) as e:
+        logger.error(f"Error parsing book data at {book_url}: {str(e)}")
+        return None
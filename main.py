@@ -1,19 +1,29 @@
-import json
+import hashlib
 import logging
 import asyncio
 import os
 import aiohttp
+import httpx
+import orjson
 from typing import List, Tuple, Dict, Any
-from .book_scraper import BookScraper
+from .book_scraper import BookScraper, MAX_RETRIES, RETRY_BACKOFF_SECONDS
 from .book_model import Book
 
+# Use uvloop's C event loop when available; the workload is ~1000 concurrent
+# HTTP requests, where it clearly outperforms the pure-Python asyncio loop.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 """
 Main module for asynchronous book scraping and database upsert operations.
 
 This module performs the following tasks:
-1. Retrieves all book URLs using a BookScraper instance.
-2. Processes each book URL concurrently to extract book information.
-3. Upserts the successfully scraped book data into a database in batches.
+1. Streams book URLs from a BookScraper instance as catalogue pages are discovered.
+2. Processes the streamed book URLs concurrently to extract book information.
+3. Upserts scraped book data into a database in batches, overlapping with scraping.
 4. Handles concurrent database operations using an asyncio semaphore.
 5. Provides an AWS Lambda compatible handler via the lambda_handler function.
 """
@@ -28,22 +38,168 @@ logger = logging.getLogger(__name__)
 # Constants
 BASE_URL = os.getenv("BASE_URL")  # The base URL used for scraping book information.
 DB_URL_UPSERT_BATCH = os.getenv("DB_URL_UPSERT_BATCH")  # Endpoint for batch upsert operations in the database.
+DB_URL_CONTENT_HASHES = os.getenv("DB_URL_CONTENT_HASHES")  # Optional endpoint returning stored {upc: content_hash} pairs.
 CONCURRENT_DB_OPS = int(os.getenv("CONCURRENT_DB_OPS", "5"))  # Maximum number of concurrent database operations.
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "25"))  # Maximum number of books to process in a single database upsert batch.
+CONCURRENT_HTTP = int(os.getenv("CONCURRENT_HTTP", "20"))  # Maximum number of book pages fetched concurrently.
+
+# Event loop and HTTP clients persisted at module scope so that warm Lambda
+# invocations reuse established connections and DNS caches instead of paying
+# a fresh TCP/TLS handshake per host on every run.
+_LOOP = asyncio.new_event_loop()
+_SCRAPE_SESSION: aiohttp.ClientSession = None
+_DB_CLIENT: httpx.AsyncClient = None
+
+def _get_scrape_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session for scrape traffic, creating it on first use.
+
+    The session bounds its connection pool to CONCURRENT_HTTP total and per-host
+    connections, caches DNS lookups, keeps connections alive between requests, and
+    asks for compressed pages (aiohttp inflates gzip/deflate in C; brotli is not
+    advertised because the optional codec is not a dependency).
+
+    Returns:
+      - aiohttp.ClientSession: The lazily created, module-wide scrape session.
+    """
+    global _SCRAPE_SESSION
+    if _SCRAPE_SESSION is None or _SCRAPE_SESSION.closed:
+        connector = aiohttp.TCPConnector(
+            limit=CONCURRENT_HTTP,
+            limit_per_host=CONCURRENT_HTTP,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+        )
+        _SCRAPE_SESSION = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                'Accept-Encoding': 'gzip, deflate',
+                'User-Agent': 'Bookstore-Scraper/1.0 (+https://github.com/AhmedElshehawy/Bookstore_Scraper)',
+            },
+        )
+    return _SCRAPE_SESSION
+
+def _get_db_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP/2-capable httpx client for database traffic, creating it on first use.
+
+    HTTP/2 lets concurrent upsert batches multiplex over a single TCP/TLS connection
+    when the endpoint supports it; httpx falls back to HTTP/1.1 otherwise.
+
+    Returns:
+      - httpx.AsyncClient: The lazily created, module-wide database client.
+    """
+    global _DB_CLIENT
+    if _DB_CLIENT is None or _DB_CLIENT.is_closed:
+        _DB_CLIENT = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=CONCURRENT_DB_OPS),
+            timeout=30,
+        )
+    return _DB_CLIENT
+
+async def _prewarm() -> None:
+    """
+    Open connections to the scrape host and database endpoint ahead of the first real request.
+
+    A cheap HEAD request per host forces DNS resolution and the TCP/TLS handshake to
+    happen during cold-start initialization, so the first invocation's scrape and
+    upsert traffic rides already-established connections from the module-level pools.
+    Failures are logged and swallowed: prewarming is purely opportunistic and must
+    never block or fail an invocation.
+    """
+    async def _touch(coro, target):
+        try:
+            await asyncio.wait_for(coro, timeout=5)
+        except Exception as e:
+            logger.debug(f"Prewarm of {target} did not complete: {e}")
+
+    tasks = []
+    if BASE_URL:
+        session = _get_scrape_session()
+        async def _touch_scrape():
+            async with session.head(BASE_URL) as response:
+                await response.read()
+        tasks.append(_touch(_touch_scrape(), BASE_URL))
+    if DB_URL_UPSERT_BATCH:
+        client = _get_db_client()
+        tasks.append(_touch(client.head(DB_URL_UPSERT_BATCH), DB_URL_UPSERT_BATCH))
+    if tasks:
+        await asyncio.gather(*tasks)
+
+MAX_WAIT_MS = int(os.getenv("MAX_WAIT_MS", "1000"))  # Longest a partial upsert batch may wait before being flushed.
+MAX_REPORTED_ERRORS = int(os.getenv("MAX_REPORTED_ERRORS", "50"))  # Maximum number of error details included in the Lambda response.
+
+# Run the prewarm during module import: Lambda cold-start initialization happens
+# before the first invocation is billed against the handler, so the handshakes
+# overlap with the rest of container startup instead of the first request.
+if BASE_URL or DB_URL_UPSERT_BATCH:
+    _LOOP.run_until_complete(_prewarm())
+
+def _content_hash(payload: Dict[str, Any]) -> str:
+    """
+    Compute a stable content hash for a book's JSON-compatible payload dictionary.
+
+    The payload is serialized with sorted keys so the hash is independent of field
+    order, then digested with blake2b (stdlib, C-backed) truncated to 8 bytes —
+    plenty for change detection across a few thousand books.
+
+    Parameters:
+      - payload (Dict[str, Any]): A Book converted via model_dump(mode='json').
+
+    Returns:
+      - str: A 16-character hex digest of the payload.
+    """
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=8).hexdigest()
+
+async def fetch_known_hashes(db_client: httpx.AsyncClient) -> Dict[str, str]:
+    """
+    Fetch the stored {upc: content_hash} mapping from the database service.
+
+    One GET against DB_URL_CONTENT_HASHES replaces a per-book existence/diff
+    round-trip: books whose freshly computed hash matches the stored one are
+    dropped from the upsert stream entirely. When the endpoint is not configured
+    or the request fails, an empty mapping is returned so every book is upserted,
+    which is always correct — just less economical.
+
+    Parameters:
+      - db_client (httpx.AsyncClient): The HTTP client used for database requests.
+
+    Returns:
+      - Dict[str, str]: Stored content hashes keyed by UPC; empty when unavailable.
+    """
+    if not DB_URL_CONTENT_HASHES:
+        return {}
+    try:
+        response = await db_client.get(DB_URL_CONTENT_HASHES)
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, dict):
+                return data
+            logger.warning(f"Content-hash endpoint returned {type(data).__name__} instead of an object; upserting all books.")
+        else:
+            logger.warning(f"Content-hash endpoint returned {response.status_code}; upserting all books.")
+    except Exception as e:
+        logger.warning(f"Could not fetch content hashes ({e}); upserting all books.")
+    return {}
 
-async def process_book(session: aiohttp.ClientSession, book_url: str, scraper: BookScraper) -> Tuple[Book, str]:
+async def process_book(session: aiohttp.ClientSession, book_url: str, scraper: BookScraper, semaphore: asyncio.Semaphore) -> Tuple[Book, str]:
     """
     Process a single book URL using the provided scraper.
 
-    This function fetches and extracts book information asynchronously. If extraction is successful,
-    it returns a tuple where the first element is the Book object and the second element is None.
-    In case of an error, the function logs the error and returns a tuple with None for the Book
-    and the book URL to indicate failure.
+    This function fetches and extracts book information asynchronously, holding a slot
+    of the given semaphore for the duration of the fetch so that only a bounded number
+    of book pages are in flight at once. If extraction is successful, it returns a tuple
+    where the first element is the Book object and the second element is None.
+    In case of an error, the function logs the error and returns a tuple with None for
+    the Book and the book URL to indicate failure.
 
     Parameters:
       - session (aiohttp.ClientSession): The HTTP session for making requests.
       - book_url (str): The URL of the book to be processed.
       - scraper (BookScraper): An instance of BookScraper to extract book information.
+      - semaphore (asyncio.Semaphore): Limits how many book fetches run concurrently.
 
     Returns:
       - Tuple[Book, str]: A tuple where:
@@ -51,119 +207,226 @@ async def process_book(session: aiohttp.ClientSession, book_url: str, scraper: B
           * The second element is an error indicator (None if processing was successful).
     """
     try:
-        book_info = await scraper.extract_one_book_info(session, book_url)
+        async with semaphore:
+            book_info = await scraper.extract_one_book_info(session, book_url)
         logger.debug(f"Processed book {book_url}: {book_info.title}")
         return book_info, None
     except Exception as e:
         logger.error(f"Failed to process book {book_url}: {e}")
         return None, book_url
 
-async def process_books_batch(session: aiohttp.ClientSession, book_urls: List[str], scraper: BookScraper) -> Tuple[List[Book], List[str]]:
+async def scrape_and_upsert_books(scrape_session: aiohttp.ClientSession, db_client: httpx.AsyncClient, scraper: BookScraper, known_hashes: Dict[str, str] = None) -> Tuple[int, List[str], Dict[str, Any]]:
     """
-    Process a batch of book URLs concurrently.
+    Discover, scrape and upsert all books as a single producer/consumer pipeline.
 
-    This function leverages asynchronous tasks to process a list of book URLs in parallel.
-    It aggregates the results into two lists: one containing all successfully processed Book objects,
-    and another containing the URLs that encountered errors during processing.
+    The pipeline has three overlapping stages connected by asyncio queues:
+      1. A producer task streams book URLs from the scraper's catalogue iterator.
+      2. CONCURRENT_HTTP worker tasks drain the URL queue, extract book information,
+         hash each book's canonical payload and push the payloads of new or changed
+         books onto a book queue; books matching a stored hash never leave the client.
+      3. A batcher task drains the book queue into buckets of BATCH_SIZE and dispatches
+         each full bucket as an upsert task, waiting for one of CONCURRENT_DB_OPS
+         semaphore slots first so a slow database stalls the batcher (and, through
+         the bounded book queue, the workers) instead of buffering the catalogue.
+         A partial bucket is flushed early once no new book arrives within MAX_WAIT_MS,
+         so upsert latency stays bounded even when scraping slows down.
+
+    Because every stage runs concurrently, detail-page fetches start as soon as the
+    first catalogue page is parsed, and database writes start as soon as the first
+    batch of books is scraped. Each stage signals completion downstream with None
+    sentinels; any partially filled batch is flushed once scraping finishes. The
+    stages run under TaskGroups, so an unexpected failure in any of them cancels
+    the others (and any dispatched upserts) rather than stranding tasks on the
+    module-level event loop, where they would resume on the next warm invocation.
+
+    Scrape fetches and database posts go through separate clients so each host keeps
+    its own warm connection pool and the two request streams never contend for the
+    same slots.
 
     Parameters:
-      - session (aiohttp.ClientSession): The HTTP session used to perform the requests.
-      - book_urls (List[str]): A list of book URLs to be processed.
-      - scraper (BookScraper): An instance of BookScraper used for extracting book details.
+      - scrape_session (aiohttp.ClientSession): The HTTP session used for catalogue and book-page requests.
+      - db_client (httpx.AsyncClient): The HTTP/2-capable client used for database upsert requests.
+      - scraper (BookScraper): An instance of BookScraper used for URL discovery and extraction.
+      - known_hashes (Dict[str, str]): Stored {upc: content_hash} pairs from a previous
+        run. Books whose current hash matches are counted but never posted; pass None
+        or an empty dict to upsert everything.
+
+    Books move through the pipeline in BATCH_SIZE buckets and are released once
+    their batch is upserted, so peak memory stays proportional to the concurrency
+    settings rather than the catalogue size; only counters and error details are
+    kept for the whole run.
 
     Returns:
-      - Tuple[List[Book], List[str]]: A tuple where the first element is a list of Book objects that were
-        processed successfully and the second is a list of URLs that failed during processing.
+      - Tuple[int, List[str], Dict[str, Any]]: A tuple containing:
+          * The number of books that were scraped successfully.
+          * The list of URLs that failed during processing.
+          * A dictionary with 'processed' (successfully upserted book count),
+            'skipped_unchanged' (books dropped because their stored hash matched)
+            and 'errors' (a list of error dictionaries from failed upserts).
     """
-    tasks = [process_book(session, url, scraper) for url in book_urls]
-    results = await asyncio.gather(*tasks)
-    
-    successful_books = []
+    known_hashes = known_hashes or {}
+    url_queue: asyncio.Queue = asyncio.Queue(maxsize=CONCURRENT_HTTP * 2)
+    book_queue: asyncio.Queue = asyncio.Queue(maxsize=BATCH_SIZE * 2)
+    semaphore = asyncio.Semaphore(CONCURRENT_HTTP)
+    db_semaphore = asyncio.Semaphore(CONCURRENT_DB_OPS)
+    scraped_count = 0
+    skipped_count = 0
     failed_urls = []
-    
-    for result, failed_url in results:
-        if result:
-            successful_books.append(result)
-        if failed_url:
-            failed_urls.append(failed_url)
-            
-    return successful_books, failed_urls
+    upsert_tasks = []
+    db_status = {'processed': 0, 'errors': []}
 
-async def upsert_books_batch(session: aiohttp.ClientSession, books: List[Book]) -> Dict[str, Any]:
-    """
-    Upsert books into the database in concurrent batches.
+    async def producer():
+        async for url in scraper.iter_book_urls(scrape_session):
+            await url_queue.put(url)
+        for _ in range(CONCURRENT_HTTP):
+            await url_queue.put(None)
 
-    This function divides the list of books into smaller batches, each containing a maximum of BATCH_SIZE items.
-    Each batch is then upserted to the database concurrently, constrained by a semaphore that limits
-    the number of concurrent database operations to CONCURRENT_DB_OPS. Each Book object is first converted
-    to a dictionary form via its model_dump_json() method.
+    async def worker():
+        nonlocal scraped_count, skipped_count
+        while True:
+            url = await url_queue.get()
+            if url is None:
+                break
+            result, failed_url = await process_book(scrape_session, url, scraper, semaphore)
+            if result:
+                scraped_count += 1
+                # Hash the canonical payload and drop books the database
+                # already holds in this exact form; the hash rides along in
+                # the payload so the DB can store it for the next run.
+                payload = result.model_dump(mode='json')
+                content_hash = _content_hash(payload)
+                if known_hashes.get(payload['upc']) == content_hash:
+                    skipped_count += 1
+                else:
+                    payload['content_hash'] = content_hash
+                    await book_queue.put(payload)
+            if failed_url:
+                failed_urls.append(failed_url)
+
+    async def scrape_stage():
+        # TaskGroup cancels the sibling tasks when one fails, so a crashed
+        # producer cannot leave workers blocked on url_queue.get() forever.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(producer())
+            for _ in range(CONCURRENT_HTTP):
+                tg.create_task(worker())
+        await book_queue.put(None)
+
+    async def flush(batch):
+        # Acquire the slot before dispatching (upsert_batch releases it), so
+        # at most CONCURRENT_DB_OPS batches exist outside the batcher at once.
+        # When the DB falls behind, the batcher blocks here, book_queue fills
+        # and the workers stall — backpressure instead of unbounded buffering.
+        await db_semaphore.acquire()
+        upsert_tasks.append(asyncio.create_task(upsert_batch(db_client, batch, db_semaphore)))
+
+    async def db_batcher():
+        batch = []
+        while True:
+            try:
+                book = await asyncio.wait_for(book_queue.get(), timeout=MAX_WAIT_MS / 1000)
+            except asyncio.TimeoutError:
+                # Coalescing window expired: ship whatever has accumulated so a
+                # slow scrape phase cannot hold a partial batch back indefinitely.
+                if batch:
+                    await flush(batch)
+                    batch = []
+                continue
+            if book is None:
+                break
+            batch.append(book)
+            if len(batch) >= BATCH_SIZE:
+                await flush(batch)
+                batch = []
+        # Flush the final partial batch once scraping is done.
+        if batch:
+            await flush(batch)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(scrape_stage())
+            tg.create_task(db_batcher())
+    except BaseException:
+        # The loop outlives the invocation, so nothing may be left running:
+        # the TaskGroup has cancelled its own children, but the dispatched
+        # upsert tasks are not among them and must be reaped here.
+        for task in upsert_tasks:
+            task.cancel()
+        await asyncio.gather(*upsert_tasks, return_exceptions=True)
+        raise
+
+    for processed, errors in await asyncio.gather(*upsert_tasks):
+        db_status['processed'] += processed
+        db_status['errors'].extend(errors)
+    db_status['skipped_unchanged'] = skipped_count
 
-    In case an upsert operation for a batch fails (i.e., response.status != 200), corresponding error
-    messages are aggregated for each book in the batch.
+    return scraped_count, failed_urls, db_status
+
+async def upsert_batch(db_client: httpx.AsyncClient, batch: List[Dict], semaphore: asyncio.Semaphore) -> Tuple[int, List[Dict]]:
+    """
+    Upsert a single batch of books into the database.
+
+    The batch of JSON-compatible payload dictionaries (each carrying its
+    content_hash) is encoded once with orjson and posted to the DB_URL_UPSERT_BATCH endpoint. The caller
+    acquires a slot of the given semaphore before dispatching this coroutine and it
+    is released here on completion, bounding how many batches exist outside the
+    batcher at any moment. Transport errors and 5xx responses are retried up to
+    MAX_RETRIES times with exponential backoff; if the upsert still fails, or the
+    endpoint returns a non-retryable error status, corresponding error messages are
+    aggregated for each book in the batch.
 
     Parameters:
-      - session (aiohttp.ClientSession): The HTTP session used for sending requests to the database endpoint.
-      - books (List[Book]): A list of Book objects to upsert into the database.
+      - db_client (httpx.AsyncClient): The HTTP client used for sending requests to the database endpoint.
+      - batch (List[Dict]): Payload dictionaries for the current upsert operation.
+      - semaphore (asyncio.Semaphore): The slot acquired by the caller, released on completion.
 
     Returns:
-      - Dict[str, Any]: A dictionary containing:
-          * 'processed': The total number of successfully upserted books.
-          * 'errors': A list of error dictionaries with details on upsert failures.
+      - Tuple[int, List[Dict]]: A tuple where:
+          * The first element is the count of books successfully processed in this batch.
+          * The second element is a list of error details (if any) encountered during this batch operation.
     """
-    db_status = {'processed': 0, 'errors': []}
-    
-    # Partition books into batches according to BATCH_SIZE.
-    batches = [books[i:i+BATCH_SIZE] for i in range(0, len(books), BATCH_SIZE)]
-    semaphore = asyncio.Semaphore(CONCURRENT_DB_OPS)
-    
-    async def upsert_batch(batch: List[Book]) -> Tuple[int, List[Dict]]:
-        """
-        Helper function to upsert a single batch of books.
-
-        Parameters:
-          - batch (List[Book]): A subset of books for the current upsert operation.
-
-        Returns:
-          - Tuple[int, List[Dict]]: A tuple where:
-              * The first element is the count of books successfully processed in this batch.
-              * The second element is a list of error details (if any) encountered during this batch operation.
-        """
-        # Convert each Book to its dictionary representation.
-        payload = [json.loads(book.model_dump_json()) for book in batch]
-        async with semaphore:
+    try:
+        # Encode the request body once with orjson rather than the client's
+        # stdlib encoder; the dicts were already canonicalized by the workers.
+        body = orjson.dumps(batch)
+        last_error = None
+        for attempt in range(MAX_RETRIES):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
             try:
-                async with session.post(DB_URL_UPSERT_BATCH, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        errors = [{'book_url': b.get('book_url', 'unknown'), 'error': error_text} for b in payload]
-                        return 0, errors
-                    else:
-                        return len(batch), []
+                response = await db_client.post(
+                    DB_URL_UPSERT_BATCH,
+                    content=body,
+                    headers={'Content-Type': 'application/json'},
+                )
             except Exception as e:
-                errors = [
-                    {'book_url': json.loads(book.model_dump_json()).get('book_url', 'unknown'), 'error': str(e)} 
-                    for book in batch
-                ]
+                last_error = str(e)
+                logger.warning(f"Transient error upserting batch (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+                continue
+            if response.status_code >= 500:
+                # Server-side hiccups are worth retrying; client errors are not.
+                last_error = response.text
+                logger.warning(f"Transient {response.status_code} upserting batch (attempt {attempt + 1}/{MAX_RETRIES}).")
+                continue
+            if response.status_code != 200:
+                errors = [{'book_url': b.get('book_url', 'unknown'), 'error': response.text} for b in batch]
                 return 0, errors
-    
-    tasks = [upsert_batch(batch) for batch in batches]
-    results = await asyncio.gather(*tasks)
-    
-    for processed, errors in results:
-        db_status['processed'] += processed
-        db_status['errors'].extend(errors)
-        
-    return db_status
+            return len(batch), []
+        errors = [{'book_url': b.get('book_url', 'unknown'), 'error': last_error} for b in batch]
+        return 0, errors
+    finally:
+        semaphore.release()
 
 async def main() -> Dict:
     """
     Main asynchronous function that orchestrates book scraping and database operations.
 
     The function performs the following steps:
-      1. Creates an aiohttp session.
-      2. Instantiates a BookScraper using BASE_URL and retrieves all book URLs.
-      3. Processes the list of book URLs concurrently to extract book information.
-      4. Upserts the successfully scraped books into the database in batches.
+      1. Obtains the persistent aiohttp session for the scrape host and the persistent
+         HTTP/2 httpx client for the database endpoint.
+      2. Instantiates a BookScraper using BASE_URL.
+      3. Streams book URLs through the scrape pipeline, extracting book information concurrently.
+      4. Upserts scraped books into the database in batches while scraping is still running.
       5. Logs a summary of the process, including successes and failures.
 
     If any unexpected error occurs, it is caught and logged, and the resulting status reflects the failure.
@@ -177,46 +440,54 @@ async def main() -> Dict:
               - db_status: The upsert status from the database operation.
     """
     db_status = {'processed': 0, 'errors': [], 'success': True}
-    
-    async with aiohttp.ClientSession() as session:
-        try:
-            # Initialize the scraper and retrieve all book URLs.
-            scraper = BookScraper(BASE_URL)
-            book_urls = await scraper.get_all_book_urls(session)
-            
-            # Concurrently process each book URL.
-            all_scraped_books, all_failed_books = await process_books_batch(session, book_urls, scraper)
-            
-            # Upsert the successfully scraped books, if any.
-            if all_scraped_books:
-                db_result = await upsert_books_batch(session, all_scraped_books)
-                db_status.update(db_result)
-            
-            logger.info(f"Processing completed. Processed {len(all_scraped_books)} books, {len(all_failed_books)} failed.")
-            if all_failed_books:
-                logger.info(f"Failed books: {all_failed_books}")
-            logger.info(f"Database uploads: {db_status['processed']} successful, {len(db_status['errors'])} failed.")
-            
-        except Exception as e:
-            db_status['success'] = False
-            db_status['errors'].append({'error': str(e)})
-            logger.error(f"Main process failed: {e}")
-    
+
+    # The sessions are module-level singletons: on a warm Lambda container they
+    # arrive with established connections and populated DNS caches, and they
+    # are deliberately not closed here (container teardown reclaims them).
+    scrape_session = _get_scrape_session()
+    db_client = _get_db_client()
+    try:
+        # Initialize the scraper and run URL discovery, detail extraction
+        # and database upserts as one overlapping pipeline. The stored hash
+        # snapshot lets the pipeline drop books the database already holds.
+        scraper = BookScraper(BASE_URL)
+        known_hashes = await fetch_known_hashes(db_client)
+        scraped_count, all_failed_books, db_result = await scrape_and_upsert_books(scrape_session, db_client, scraper, known_hashes)
+        db_status.update(db_result)
+
+        logger.info(f"Processing completed. Processed {scraped_count} books, {len(all_failed_books)} failed.")
+        if all_failed_books:
+            logger.info(f"Failed books: {all_failed_books}")
+        logger.info(f"Database uploads: {db_status['processed']} successful, {db_status.get('skipped_unchanged', 0)} skipped as unchanged, {len(db_status['errors'])} failed.")
+
+    except Exception as e:
+        db_status['success'] = False
+        db_status['errors'].append({'error': str(e)})
+        logger.error(f"Main process failed: {e}")
+
+
+    # Cap the error details in the response body; a large failure set would
+    # otherwise balloon the serialized payload to several megabytes.
+    if len(db_status['errors']) > MAX_REPORTED_ERRORS:
+        db_status['errors_truncated_count'] = len(db_status['errors']) - MAX_REPORTED_ERRORS
+        db_status['errors'] = db_status['errors'][:MAX_REPORTED_ERRORS]
+
     return {
         'statusCode': 200 if db_status['success'] else 500,
-        'body': json.dumps({
-            'processed_books': len(all_scraped_books) if 'all_scraped_books' in locals() else 0,
+        'body': orjson.dumps({
+            'processed_books': scraped_count if 'scraped_count' in locals() else 0,
             'failed_books': len(all_failed_books) if 'all_failed_books' in locals() else 0,
             'db_status': db_status,
-        })
+        }).decode()
     }
 
 def lambda_handler(event: Dict, context: Any) -> Dict:
     """
     AWS Lambda handler function.
 
-    This function acts as the entry point for AWS Lambda execution. It triggers the execution
-    of the main asynchronous function using asyncio.run and returns its outcome.
+    This function acts as the entry point for AWS Lambda execution. It runs the main
+    asynchronous function on the module-level event loop, which survives across warm
+    invocations together with the pooled HTTP clients.
 
     Parameters:
       - event (Dict): The event payload provided by AWS Lambda.
@@ -225,4 +496,4 @@ def lambda_handler(event: Dict, context: Any) -> Dict:
     Returns:
       - Dict: A dictionary representing the result of the main function, following an HTTP-like response structure.
     """
-    return asyncio.run(main())
+    return _LOOP.run_until_complete(main())